@@ -1,21 +1,51 @@
 import argparse
+import hashlib
 import importlib
 import os
 import sys
-from typing import Dict, Iterable, Tuple
+from collections import Counter
+from types import ModuleType
+from typing import Dict, FrozenSet, Iterator, Tuple
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 from importlib.util import module_from_spec, spec_from_file_location
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone
 
 
-EXPECTED_VALUES: Dict[str, Iterable[str]] = {
-    "trim_level": {"Base", "Sport", "Premium", "Limited"},
-    "transmission": {"automatic", "manual", "CVT", "dual clutch"},
-    "fuel_type": {"gasoline", "diesel", "hybrid", "electric"},
+EXPECTED_VALUES: Dict[str, FrozenSet[str]] = {
+    "trim_level": frozenset({"Base", "Sport", "Premium", "Limited"}),
+    "transmission": frozenset({"automatic", "manual", "CVT", "dual clutch"}),
+    "fuel_type": frozenset({"gasoline", "diesel", "hybrid", "electric"}),
 }
 
+# Built once at import so each chunk reuses the same Index for membership checks.
+_EXPECTED_INDEXES: Dict[str, pd.Index] = {
+    column: pd.Index(sorted(values)) for column, values in EXPECTED_VALUES.items()
+}
+
+# infer_dtype() results for object columns that may hold str values.
+STRING_INFERRED_TYPES = {"string", "mixed", "mixed-integer"}
+
+# Reports go here unless an explicit --report path is given.
+DEFAULT_REPORT_DIR = Path("generated_data")
+
+# CSV sources are streamed in chunks of this many rows.
+CSV_CHUNK_SIZE = 100_000
+
+# Columns whose values are expected to be numeric.
+NUMERIC_COLUMNS = ("msrp", "model_year")
+
+# Decimal/scientific literals and inf/infinity, the text forms pd.to_numeric()
+# accepts. Digits are ASCII-only and only numbers may carry surrounding spaces,
+# as in to_numeric.
+NUMERIC_PATTERN = (
+    r"(?i)^(\s*[-+]?([0-9]+(\.[0-9]*)?|\.[0-9]+)(e[-+]?[0-9]+)?\s*|[-+]?inf(inity)?)$"
+)
+
 
 def _module_name(module_path: str) -> str:
     """Convert a filesystem path like 'data_generation.py' to an importable module string."""
@@ -47,21 +77,142 @@ def _resolve_candidate_path(source: str) -> Path | None:
     return None
 
 
-def _load_dataframe(source: str) -> pd.DataFrame:
-    """Load a DataFrame either from a generator module or a CSV file."""
+def _is_arrow_string(dtype: object) -> bool:
+    """Return True for Arrow-backed string dtypes such as string[pyarrow]."""
+    return isinstance(dtype, pd.ArrowDtype) and (
+        pa.types.is_string(dtype.pyarrow_dtype)
+        or pa.types.is_large_string(dtype.pyarrow_dtype)
+    )
+
+
+def _count_non_numeric(series: pd.Series) -> int:
+    """Count nulls plus values that would not coerce to a number."""
+    if pd.api.types.is_numeric_dtype(series):
+        return int(series.isna().sum())
+    if _is_arrow_string(series.dtype):
+        # Match in Arrow rather than boxing every value into a Python str.
+        values = pa.array(series)
+        numeric_count = pc.sum(
+            pc.match_substring_regex(values, NUMERIC_PATTERN).cast(pa.int64())
+        ).as_py()
+        return len(values) - (numeric_count or 0)
+    return int(pd.to_numeric(series, errors="coerce").isna().sum())
+
+
+def _count_padded_strings(series: pd.Series, value_types: pd.Series) -> int:
+    """Count string values with leading or trailing whitespace.
+
+    value_types holds type(value) for each entry of series, as computed by the
+    caller's mixed-type check.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        padded_categories = [
+            value
+            for value in series.cat.categories
+            if isinstance(value, str) and value != value.strip()
+        ]
+        return int(series.isin(padded_categories).sum())
+
+    if _is_arrow_string(series.dtype):
+        return _count_padded_arrow(pa.array(series))
+
+    inferred_type = pd.api.types.infer_dtype(series, skipna=True)
+    if inferred_type not in STRING_INFERRED_TYPES:
+        return 0
+    if inferred_type != "string":
+        # Only the str entries of a mixed column can carry padding.
+        series = series[value_types.eq(str)]
+    # Object columns convert to Arrow in one pass, which avoids materialising a
+    # stripped copy of every value.
+    return _count_padded_arrow(pa.array(series, type=pa.string(), from_pandas=True))
+
+
+def _count_padded_arrow(values: pa.Array) -> int:
+    """Count Arrow string values that differ from their whitespace-trimmed form."""
+    padded_mask = pc.not_equal(values, pc.utf8_trim_whitespace(values))
+    return pc.sum(padded_mask.cast(pa.int64())).as_py() or 0
+
+
+def _column_salt(column: str) -> np.uint64:
+    """Stable per-column value mixed into row hashes of str entries."""
+    return pd.util.hash_array(np.array([column], dtype=object))[0]
+
+
+# Generator modules loaded from a file path: path -> (mtime, module).
+_MODULE_CACHE: Dict[str, Tuple[float, ModuleType]] = {}
+
+
+def _load_module(module_path: str) -> ModuleType:
+    """Execute a generator module from disk, reusing it until the file changes."""
+    mtime = os.stat(module_path).st_mtime
+    cached = _MODULE_CACHE.get(module_path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    module_name = f"generator_module_{hashlib.sha256(module_path.encode()).hexdigest()}"
+    spec = spec_from_file_location(module_name, module_path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Unable to load module from {module_path}")
+    module = module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)  # type: ignore[arg-type]
+    # Replacing the entry drops the previous version of the module.
+    _MODULE_CACHE[module_path] = (mtime, module)
+    return module
+
+
+def _read_csv_chunks(path: Path) -> Iterator[pd.DataFrame]:
+    """Stream a CSV in chunks that share the dtypes whole-file parsing would infer."""
+    reader = pd.read_csv(path, chunksize=CSV_CHUNK_SIZE, dtype_backend="pyarrow")
+    first_chunk = next(reader, None)
+    if first_chunk is None:
+        return
+    second_chunk = next(reader, None)
+    if second_chunk is None:
+        yield first_chunk
+        return
+
+    # read_csv infers dtypes per chunk, so a column can be int in one chunk and
+    # float or str in another. Scan the chunk dtypes once, then re-read with the
+    # dtype whole-file inference would have picked for each such column.
+    chunk_dtypes = [first_chunk.dtypes, second_chunk.dtypes]
+    del first_chunk, second_chunk
+    chunk_dtypes.extend(chunk.dtypes for chunk in reader)
+    yield from pd.read_csv(
+        path,
+        chunksize=CSV_CHUNK_SIZE,
+        dtype_backend="pyarrow",
+        dtype=_unify_chunk_dtypes(chunk_dtypes),
+    )
+
+
+def _unify_chunk_dtypes(chunk_dtypes: list[pd.Series]) -> Dict[str, pd.ArrowDtype]:
+    """Pick one Arrow dtype for each column whose inferred dtype varies between chunks."""
+    unified: Dict[str, pd.ArrowDtype] = {}
+    for column in chunk_dtypes[0].index:
+        seen = {dtypes[column].pyarrow_dtype for dtypes in chunk_dtypes}
+        if len(seen) == 1:
+            continue
+        typed = {arrow_type for arrow_type in seen if not pa.types.is_null(arrow_type)}
+        if len(typed) == 1:
+            unified[column] = pd.ArrowDtype(typed.pop())
+        elif all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in typed):
+            unified[column] = pd.ArrowDtype(pa.float64())
+        else:
+            unified[column] = pd.ArrowDtype(pa.string())
+    return unified
+
+
+def _load_dataframe(source: str) -> pd.DataFrame | Iterator[pd.DataFrame]:
+    """Load a DataFrame from a generator module, or stream a CSV file in chunks."""
     resolved_path = _resolve_candidate_path(source)
 
     if resolved_path is not None:
         if resolved_path.suffix.lower() == ".csv":
-            return pd.read_csv(resolved_path)
+            return _read_csv_chunks(resolved_path)
 
         if resolved_path.suffix.lower() == ".py":
-            spec = spec_from_file_location("generator_module", resolved_path)
-            if spec is None or spec.loader is None:
-                raise ImportError(f"Unable to load module from {resolved_path}")
-            module = module_from_spec(spec)
-            sys.modules["generator_module"] = module
-            spec.loader.exec_module(module)  # type: ignore[arg-type]
+            module = _load_module(str(resolved_path))
         else:
             raise ValueError(
                 f"Unsupported file type '{resolved_path.suffix}' for data source"
@@ -79,84 +230,172 @@ def _load_dataframe(source: str) -> pd.DataFrame:
     return generator_fn()
 
 
-def diagnose_generated_data(source: str = "data_generation.py", report_path: str | None = None) -> None:
-    """Generate a diagnosis report for the raw car equipment data."""
-    df = _load_dataframe(source)
-    report_lines = [
-        "Data diagnosis report",
-        f"- Rows: {len(df)}",
-        f"- Columns: {len(df.columns)}",
-    ]
-
-    duplicate_count = int(df.duplicated().sum())
-    report_lines.append(f"- Duplicate rows detected: {duplicate_count}")
-
-    null_counts = df.isna().sum()
-    null_columns = [
-        f"{col} ({count})" for col, count in null_counts.items() if int(count) > 0
-    ]
-    if null_columns:
-        report_lines.append("- Columns containing null values: " + ", ".join(null_columns))
-    else:
-        report_lines.append("- Columns containing null values: none")
+class _DiagnosisAccumulator:
+    """Reduce diagnosis statistics over one or more DataFrame chunks."""
 
-    for column in df.columns:
-        distinct_types = {type(val).__name__ for val in df[column].dropna()}
-        if len(distinct_types) > 1:
-            report_lines.append(
-                f"- Mixed data types in '{column}': {', '.join(sorted(distinct_types))}"
-            )
+    def __init__(self) -> None:
+        self.columns: list[str] = []
+        self.row_total = 0
+        self.null_counts: Counter[str] = Counter()
+        self.value_types: Dict[str, set[str]] = {}
+        self.string_issue_counts: Counter[str] = Counter()
+        self.unexpected_values: Dict[str, set[str]] = {}
+        self.non_numeric_counts: Counter[str] = Counter()
+        self._row_hashes: list[np.ndarray] = []
 
-    string_issues: Dict[str, Tuple[int, str]] = {}
-    for column in df.select_dtypes(include="object").columns:
-        series = df[column].dropna()
-        string_series = series[series.apply(lambda value: isinstance(value, str))]
-        trimmed_mismatch = string_series[string_series != string_series.str.strip()]
-        if not trimmed_mismatch.empty:
-            string_issues[column] = (
-                len(trimmed_mismatch),
-                "leading/trailing spaces",
-            )
+    def update(self, df: pd.DataFrame) -> None:
+        """Fold one chunk into the running statistics."""
+        if not self.columns:
+            self.columns = list(df.columns)
+        self.row_total += len(df)
 
-    for column, (count, description) in string_issues.items():
-        report_lines.append(f"- {count} values in '{column}' have {description}")
+        # Chunks from _read_csv_chunks() share dtypes, so row hashes are comparable
+        # across chunks.
+        row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
 
-    for column, expected in EXPECTED_VALUES.items():
-        if column not in df.columns:
-            continue
-        unexpected_values = set()
-        for value in df[column].dropna():
-            if not isinstance(value, str):
-                unexpected_values.add(type(value).__name__)
+        # Known-domain str columns become categoricals, so the checks below work on
+        # integer codes and each distinct value is inspected only once. Mixed
+        # columns stay as they are: categories would merge equal values of
+        # different types such as 5 and 5.0. All-null columns infer as "empty".
+        df = df.astype(
+            {
+                column: "category"
+                for column in EXPECTED_VALUES
+                if column in df.columns
+                and pd.api.types.infer_dtype(df[column], skipna=True) == "string"
+            }
+        )
+
+        for column in df.columns:
+            full_series = df[column]
+            series = full_series.dropna()
+            # dropna() already ran, so nulls are counted without an isna() matrix.
+            null_count = len(full_series) - len(series)
+            if null_count:
+                self.null_counts[column] += null_count
+
+            if column in NUMERIC_COLUMNS:
+                self.non_numeric_counts[column] += _count_non_numeric(full_series)
+
+            # All-null columns (null[pyarrow] from an empty CSV column) have no
+            # values to type-check, and Arrow's null type rejects the ops below.
+            if series.empty:
                 continue
-            if value not in expected:
-                unexpected_values.add(value)
-        if unexpected_values:
-            report_lines.append(
-                f"- Unexpected values in '{column}': {', '.join(sorted(unexpected_values))}"
-            )
 
-    if "msrp" in df.columns:
-        numeric_series = pd.to_numeric(df["msrp"], errors="coerce")
-        non_numeric_count = int(numeric_series.isna().sum())
-        if non_numeric_count:
-            report_lines.append(
-                f"- 'msrp' contains {non_numeric_count} non-numeric values"
-            )
+            value_types = series.map(type)
+
+            type_names = {value_type.__name__ for value_type in pd.unique(value_types)}
+            self.value_types.setdefault(column, set()).update(type_names)
+            if len(type_names) > 1 and "str" in type_names:
+                # Mixed object columns hash their values as text, so salt the str
+                # entries to keep 2015 and "2015" distinct, as df.duplicated() does.
+                str_rows = np.zeros(len(full_series), dtype=bool)
+                str_rows[full_series.notna().to_numpy()] = value_types.eq(str).to_numpy()
+                row_hashes[str_rows] ^= _column_salt(column)
+
+            if pd.api.types.is_string_dtype(full_series.dtype) or isinstance(
+                full_series.dtype, pd.CategoricalDtype
+            ):
+                self.string_issue_counts[column] += _count_padded_strings(series, value_types)
+
+            if column in EXPECTED_VALUES:
+                unexpected_values = self.unexpected_values.setdefault(column, set())
+                if isinstance(series.dtype, pd.CategoricalDtype):
+                    categories = series.cat.remove_unused_categories().cat.categories
+                    unexpected_values.update(
+                        categories.difference(_EXPECTED_INDEXES[column])
+                    )
+                else:
+                    string_mask = value_types.eq(str)
+                    unexpected_values.update(
+                        series[string_mask & ~series.isin(_EXPECTED_INDEXES[column])].unique()
+                    )
+                    unexpected_values.update(
+                        value_type.__name__
+                        for value_type in pd.unique(value_types[~string_mask])
+                    )
+
+        self._row_hashes.append(row_hashes)
+
+    @property
+    def duplicate_count(self) -> int:
+        """Rows whose hash matches an earlier row, across all chunks."""
+        if not self._row_hashes:
+            return 0
+        row_hashes = np.concatenate(self._row_hashes)
+        return int(len(row_hashes) - len(pd.unique(row_hashes)))
+
+    def report_lines(self) -> list[str]:
+        """Format the accumulated statistics as report lines."""
+        report_lines = [
+            "Data diagnosis report",
+            f"- Rows: {self.row_total}",
+            f"- Columns: {len(self.columns)}",
+            f"- Duplicate rows detected: {self.duplicate_count}",
+        ]
+
+        null_columns = [
+            f"{col} ({self.null_counts[col]})"
+            for col in self.columns
+            if self.null_counts[col] > 0
+        ]
+        if null_columns:
+            report_lines.append("- Columns containing null values: " + ", ".join(null_columns))
+        else:
+            report_lines.append("- Columns containing null values: none")
+
+        for column in self.columns:
+            distinct_types = self.value_types.get(column, set())
+            if len(distinct_types) > 1:
+                report_lines.append(
+                    f"- Mixed data types in '{column}': {', '.join(sorted(distinct_types))}"
+                )
+
+        for column in self.columns:
+            count = self.string_issue_counts[column]
+            if count:
+                report_lines.append(
+                    f"- {count} values in '{column}' have leading/trailing spaces"
+                )
+
+        for column in EXPECTED_VALUES:
+            unexpected_values = self.unexpected_values.get(column)
+            if unexpected_values:
+                report_lines.append(
+                    f"- Unexpected values in '{column}': {', '.join(sorted(unexpected_values))}"
+                )
+
+        if "msrp" in self.columns:
+            non_numeric_count = self.non_numeric_counts["msrp"]
+            if non_numeric_count:
+                report_lines.append(
+                    f"- 'msrp' contains {non_numeric_count} non-numeric values"
+                )
+
+        if "model_year" in self.columns:
+            if self.non_numeric_counts["model_year"]:
+                report_lines.append("- 'model_year' includes non-numeric entries")
+
+        return report_lines
+
+
+def diagnose_generated_data(source: str = "data_generation.py", report_path: str | None = None) -> None:
+    """Generate a diagnosis report for the raw car equipment data."""
+    data = _load_dataframe(source)
+    chunks = [data] if isinstance(data, pd.DataFrame) else data
 
-    if "model_year" in df.columns:
-        model_year_numeric = pd.to_numeric(df["model_year"], errors="coerce")
-        if int(model_year_numeric.isna().sum()):
-            report_lines.append("- 'model_year' includes non-numeric entries")
+    accumulator = _DiagnosisAccumulator()
+    for chunk in chunks:
+        accumulator.update(chunk)
+    report_lines = accumulator.report_lines()
 
     report_text = "\n".join(report_lines)
     print(report_text)
 
     if report_path is None:
-        default_dir = Path("generated_data")
-        default_dir.mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        report_file = default_dir / f"diagnosis_report_{timestamp}.txt"
+        DEFAULT_REPORT_DIR.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+        report_file = DEFAULT_REPORT_DIR / f"diagnosis_report_{timestamp}.txt"
     else:
         report_file = Path(report_path)
         report_file.parent.mkdir(parents=True, exist_ok=True)
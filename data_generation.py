@@ -1,11 +1,13 @@
 import os
-import random
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 
 
 def generate_raw_car_equipment_data(rows: int = 30, seed: int = 7) -> pd.DataFrame:
     """Return a deliberately messy car-equipment DataFrame for ETL practice."""
-    rng = random.Random(seed)
+    rng = np.random.default_rng(seed)
 
     models_by_make = {
         "Toyota": ["Corolla", "Camry", "RAV4", "Prius"],
@@ -23,57 +25,68 @@ def generate_raw_car_equipment_data(rows: int = 30, seed: int = 7) -> pd.DataFra
     duplicate_rows_needed = max(2, rows // 6)
     base_rows = rows - duplicate_rows_needed
 
-    data = []
-    for idx in range(base_rows):
-        make = rng.choice(list(models_by_make.keys()))
-        model = rng.choice(models_by_make[make])
-        msrp = rng.randrange(22000, 70000, 500)
+    # Flatten the make -> model mapping so models can be drawn per make in one pass.
+    makes = np.array(list(models_by_make), dtype=object)
+    model_counts = np.array([len(models) for models in models_by_make.values()])
+    model_offsets = np.concatenate(([0], np.cumsum(model_counts)[:-1]))
+    flat_models = np.array(
+        [model for models in models_by_make.values() for model in models], dtype=object
+    )
 
-        row = {
-            "car_id": f"C{idx+1:03}",
-            "make": make,
-            "model": model,
-            "model_year": rng.choice(range(2013, 2024)),
-            "trim_level": rng.choice(trims),
-            "exterior_color": rng.choice(colors),
-            "transmission": rng.choice(transmissions),
-            "fuel_type": rng.choice(fuels),
-            "infotainment_system": rng.choice(infotainment),
-            "msrp": msrp,
-        }
+    make_idx = rng.integers(0, len(makes), size=base_rows)
+    model_idx = model_offsets[make_idx] + rng.integers(0, model_counts[make_idx])
 
-        # Inject common data-quality issues.
-        if rng.random() < 0.20:
-            row["model"] = f" {row['model']}  "                     # extra spaces
-        if rng.random() < 0.18:
-            row["exterior_color"] = None                            # nulls
-        if rng.random() < 0.15:
-            row["model_year"] = str(row["model_year"])              # mixed types
-        if rng.random() < 0.12:
-            row["msrp"] = f"${msrp:,}"                              # string numbers
-        if rng.random() < 0.10:
-            row["msrp"] = "N/A"                                     # nonnumeric placeholder
-        if rng.random() < 0.14:
-            row["trim_level"] = rng.choice(
-                ["standart", "Premuim", "luxary", row["trim_level"]]
-            )                                                       # misspellings
-        if rng.random() < 0.12:
-            row["transmission"] = rng.choice(
-                ["Automtic", "manuall", "automatic ", "AUTOMATIC"]
-            )                                                       # inconsistent casing/spelling
-        if rng.random() < 0.10:
-            row["fuel_type"] = rng.choice(["gasolen", "deisel", row["fuel_type"]])
-        if rng.random() < 0.08:
-            row["infotainment_system"] = None
+    car_numbers = np.char.zfill(np.arange(1, base_rows + 1).astype(str), 3)
+    columns = {
+        "car_id": np.char.add("C", car_numbers).astype(object),
+        "make": makes[make_idx],
+        "model": flat_models[model_idx],
+        "model_year": rng.integers(2013, 2024, size=base_rows).astype(object),
+        "trim_level": rng.choice(np.array(trims, dtype=object), size=base_rows),
+        "exterior_color": rng.choice(np.array(colors, dtype=object), size=base_rows),
+        "transmission": rng.choice(np.array(transmissions, dtype=object), size=base_rows),
+        "fuel_type": rng.choice(np.array(fuels, dtype=object), size=base_rows),
+        "infotainment_system": rng.choice(np.array(infotainment, dtype=object), size=base_rows),
+        "msrp": (rng.integers(22000 // 500, 70000 // 500, size=base_rows) * 500).astype(object),
+    }
 
-        data.append(row)
+    def issue_mask(probability: float) -> np.ndarray:
+        return rng.random(base_rows) < probability
 
-    for _ in range(duplicate_rows_needed):
-        duplicate_row = rng.choice(data)
-        data.append(duplicate_row.copy())  # intentional duplicate values
+    # Inject common data-quality issues.
+    mask = issue_mask(0.20)
+    columns["model"][mask] = " " + columns["model"][mask] + "  "            # extra spaces
+    columns["exterior_color"][issue_mask(0.18)] = None                      # nulls
+    mask = issue_mask(0.15)
+    columns["model_year"][mask] = columns["model_year"][mask].astype(str).astype(object)  # mixed types
+    mask = issue_mask(0.12)
+    columns["msrp"][mask] = [f"${msrp:,}" for msrp in columns["msrp"][mask]]  # string numbers
+    columns["msrp"][issue_mask(0.10)] = "N/A"                               # nonnumeric placeholder
+    mask = issue_mask(0.14)
+    misspelled_trims = np.array(["standart", "Premuim", "luxary"], dtype=object)
+    picks = rng.integers(0, len(misspelled_trims) + 1, size=base_rows)      # last pick keeps the value
+    mask &= picks < len(misspelled_trims)
+    columns["trim_level"][mask] = misspelled_trims[picks[mask]]             # misspellings
+    mask = issue_mask(0.12)
+    columns["transmission"][mask] = rng.choice(
+        np.array(["Automtic", "manuall", "automatic ", "AUTOMATIC"], dtype=object),
+        size=int(mask.sum()),
+    )                                                                       # inconsistent casing/spelling
+    mask = issue_mask(0.10)
+    misspelled_fuels = np.array(["gasolen", "deisel"], dtype=object)
+    picks = rng.integers(0, len(misspelled_fuels) + 1, size=base_rows)
+    mask &= picks < len(misspelled_fuels)
+    columns["fuel_type"][mask] = misspelled_fuels[picks[mask]]
+    columns["infotainment_system"][issue_mask(0.08)] = None
 
-    rng.shuffle(data)
-    return pd.DataFrame(data).reset_index(drop=True)
+    duplicate_idx = rng.integers(0, base_rows, size=duplicate_rows_needed)  # intentional duplicate values
+    row_order = rng.permutation(base_rows + duplicate_rows_needed)
+    return pd.DataFrame(
+        {
+            name: np.concatenate([values, values[duplicate_idx]])[row_order]
+            for name, values in columns.items()
+        }
+    )
 
 
 if __name__ == "__main__":
@@ -81,4 +94,7 @@ if __name__ == "__main__":
     print(df.head())
     output_dir = "generated_data"
     os.makedirs(output_dir, exist_ok=True)
-    df.to_csv(os.path.join(output_dir, "raw_car_equipment.csv"), index=False)
+    # Mixed int/str columns are written as strings so Arrow can build the table;
+    # nulls stay empty fields, as with DataFrame.to_csv.
+    table = pa.Table.from_pandas(df.astype("string"), preserve_index=False)
+    pacsv.write_csv(table, os.path.join(output_dir, "raw_car_equipment.csv"))